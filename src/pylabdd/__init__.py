@@ -7,6 +7,8 @@ import logging
 from pathlib import Path
 from importlib.metadata import version
 from .dislocations import Dislocations
+from . import analysis
+from . import cache
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -23,4 +25,4 @@ except Exception as e:
 __author__ = """Alexander Hartmaier"""
 __email__ = 'alexander.hartmaier@rub.de'
 __version__ = version('pylabdd')
-__all__ = ["Dislocations", "calc_fpk", "calc_fpk_pbc"]
+__all__ = ["Dislocations", "analysis", "cache", "calc_fpk", "calc_fpk_pbc"]
@@ -0,0 +1,335 @@
+# Module pylabdd.analysis
+'''Module pylabdd.analysis provides functions to analyse the spatial correlations
+and patterning of a dislocation configuration stored in an object of class
+``Dislocations``: sign-resolved pair-correlation functions, detection of
+dislocation dipoles and binned maps of total and geometrically necessary
+dislocation (GND) densities.
+
+Neighbor searches are performed with cell lists, such that the computational
+effort scales linearly with the number of dislocations for a fixed cutoff
+radius. Periodic boundary conditions are respected via the minimum image
+convention if ``bc='pbc'``.
+
+uses NumPy
+
+Author: Alexander Hartmaier, ICAMS/Ruhr-University Bochum, December 2023
+Email: alexander.hartmaier@rub.de
+distributed under GNU General Public License (GPLv3)
+August 2025
+'''
+
+import numpy as np
+
+# offsets of neighbor cells, such that each pair of cells is only visited once
+CELL_OFFSETS = [(0, 0), (1, 0), (1, 1), (0, 1), (-1, 1)]
+
+
+def burgers_sign(dsl):
+    '''Sign of Burgers vectors w.r.t. the orientation of the slip planes
+
+    Parameters:
+    dsl : Dislocations
+        dislocation configuration
+
+    Returns:
+    sgn : (Ntot,)-array
+        +1 or -1 for each dislocation
+    '''
+    hh = dsl.bx*np.cos(dsl.sp_inc) + dsl.by*np.sin(dsl.sp_inc)
+    return np.where(hh<0., -1., 1.)
+
+
+def neighbor_pairs(xp, yp, lx, ly, rcut, pbc=True):
+    '''Find all pairs of dislocations that are closer than a cutoff radius,
+    using a cell list
+
+    Parameters:
+    xp, yp : (N,)-array
+        x- and y-positions of dislocations
+    lx, ly : float
+        dimensions of domain
+    rcut : float
+        cutoff radius
+    pbc (optional) : bool
+        apply minimum image convention for periodic boundary conditions
+
+    Returns:
+    ip, jp : (M,)-array
+        indices of dislocations forming pairs, each pair occurs only once
+    dx, dy : (M,)-array
+        components of distance vector pointing from ip to jp
+    '''
+    xp = np.asarray(xp, dtype=float)
+    yp = np.asarray(yp, dtype=float)
+    if rcut<=0.:
+        raise ValueError('Cutoff radius must be positive: '+str(rcut))
+    if pbc:
+        if rcut>0.5*min(lx, ly):
+            raise ValueError('Cutoff radius must not exceed half of the box size for PBC.')
+        xp = np.mod(xp, lx)
+        yp = np.mod(yp, ly)
+    # cell size >= rcut, but not smaller than the mean area per dislocation,
+    # such that the number of cells does not exceed the number of dislocations
+    hc = max(rcut, np.sqrt(lx*ly/max(len(xp), 1)))
+    ncx = max(1, int(lx/hc))  # number of cells in x-direction
+    ncy = max(1, int(ly/hc))
+    if pbc:
+        # with less than 3 cells, periodic images of neighbor cells coincide
+        if ncx<3:
+            ncx = 1
+        if ncy<3:
+            ncy = 1
+    cx = np.clip((xp*(ncx/lx)).astype(int), 0, ncx-1)
+    cy = np.clip((yp*(ncy/ly)).astype(int), 0, ncy-1)
+    cid = cy*ncx + cx
+    isort = np.argsort(cid, kind='stable')
+    start = np.searchsorted(cid[isort], np.arange(ncx*ncy+1))
+    il = []
+    jl = []
+    for ox, oy in CELL_OFFSETS:
+        if (ncx==1 and ox!=0) or (ncy==1 and oy!=0):
+            continue  # only a single cell in this direction
+        nx = cx + ox
+        ny = cy + oy
+        if pbc:
+            nx = np.mod(nx, ncx)
+            ny = np.mod(ny, ncy)
+            ind = np.arange(len(xp))
+        else:
+            ind = np.nonzero((nx>=0) & (nx<ncx) & (ny<ncy))[0]
+            nx = nx[ind]
+            ny = ny[ind]
+        ncid = ny*ncx + nx
+        counts = start[ncid+1] - start[ncid]
+        hi = np.repeat(ind, counts)
+        hh = np.arange(np.sum(counts)) - np.repeat(np.cumsum(counts)-counts, counts)
+        hj = isort[np.repeat(start[ncid], counts) + hh]
+        if ox==0 and oy==0:
+            # same cell: count each pair only once
+            ih = np.nonzero(hj>hi)[0]
+            hi = hi[ih]
+            hj = hj[ih]
+        il.append(hi)
+        jl.append(hj)
+    ip = np.concatenate(il)
+    jp = np.concatenate(jl)
+    dx = xp[jp] - xp[ip]
+    dy = yp[jp] - yp[ip]
+    if pbc:
+        dx -= lx*np.round(dx/lx)
+        dy -= ly*np.round(dy/ly)
+    ih = np.nonzero(dx*dx + dy*dy < rcut*rcut)[0]
+    return ip[ih], jp[ih], dx[ih], dy[ih]
+
+
+def pair_correlation(dsl, rmax, nbins=50, xpos=None, ypos=None):
+    '''Calculate radial pair-correlation function g(r) for all pairs of
+    dislocations, for pairs with the same sign and for pairs with opposite
+    sign of the Burgers vector. For fixed BC, no correction for boundary
+    effects is applied.
+
+    Parameters:
+    dsl : Dislocations
+        dislocation configuration
+    rmax : float
+        maximum radius
+    nbins (optional) : int
+        number of radial bins
+    xpos, ypos (optional) : (Ntot,)-array
+        positions to be analysed instead of current positions in dsl
+
+    Returns:
+    r : (nbins,)-array
+        centers of radial bins
+    g_all : (nbins,)-array
+        pair-correlation function of all dislocations
+    g_same : (nbins,)-array
+        pair-correlation function of dislocations with same sign
+    g_opp : (nbins,)-array
+        pair-correlation function of dislocations with opposite sign
+    '''
+    if xpos is None:
+        xpos = dsl.xpos
+    if ypos is None:
+        ypos = dsl.ypos
+    ip, jp, dx, dy = neighbor_pairs(xpos, ypos, dsl.lx, dsl.ly, rmax,
+                                    pbc=dsl.bc=='pbc')
+    return _pair_correlation(dsl, ip, jp, np.sqrt(dx*dx + dy*dy), rmax, nbins)
+
+
+def _pair_correlation(dsl, ip, jp, rp, rmax, nbins):
+    '''Evaluate pair-correlation functions for precomputed pairs with distances rp'''
+    sgn = burgers_sign(dsl)
+    same = sgn[ip]==sgn[jp]
+    redges = np.linspace(0., rmax, nbins+1)
+    h_same = np.histogram(rp[same], bins=redges)[0]
+    h_opp = np.histogram(rp[~same], bins=redges)[0]
+
+    # normalize by number of pairs for a uniform distribution
+    npos = np.count_nonzero(sgn>0.)
+    nneg = len(sgn) - npos
+    shell = np.pi*(redges[1:]**2 - redges[:-1]**2)/(dsl.lx*dsl.ly)
+    def norm(hist, npairs):
+        if npairs==0:
+            return np.zeros(nbins)
+        return hist/(npairs*shell)
+    g_all = norm(h_same+h_opp, len(sgn)*(len(sgn)-1)/2)
+    g_same = norm(h_same, npos*(npos-1)/2 + nneg*(nneg-1)/2)
+    g_opp = norm(h_opp, npos*nneg)
+    r = 0.5*(redges[1:] + redges[:-1])
+    return r, g_all, g_same, g_opp
+
+
+def find_dipoles(dsl, hmax, xpos=None, ypos=None):
+    '''Detect dislocation dipoles, which are defined as pairs of dislocations
+    with opposite sign that are mutual nearest neighbors of opposite sign and
+    closer to each other than a given distance.
+
+    Parameters:
+    dsl : Dislocations
+        dislocation configuration
+    hmax : float
+        maximum distance of dislocations forming a dipole
+    xpos, ypos (optional) : (Ntot,)-array
+        positions to be analysed instead of current positions in dsl
+
+    Returns:
+    dipoles : (M,2)-array
+        indices of dislocations forming dipoles
+    dist : (M,)-array
+        distance between the dislocations of each dipole
+    '''
+    if xpos is None:
+        xpos = dsl.xpos
+    if ypos is None:
+        ypos = dsl.ypos
+    ip, jp, dx, dy = neighbor_pairs(xpos, ypos, dsl.lx, dsl.ly, hmax,
+                                    pbc=dsl.bc=='pbc')
+    return _find_dipoles(dsl, ip, jp, np.sqrt(dx*dx + dy*dy))
+
+
+def _find_dipoles(dsl, ip, jp, rp):
+    '''Detect dipoles among precomputed pairs with distances rp'''
+    sgn = burgers_sign(dsl)
+    ih = np.nonzero(sgn[ip]!=sgn[jp])[0]
+    ip = ip[ih]
+    jp = jp[ih]
+    rp = rp[ih]
+
+    # nearest neighbor of opposite sign for each dislocation
+    Nd = len(sgn)
+    nn = np.full(Nd, -1)
+    if len(rp)>0:
+        ia = np.concatenate((ip, jp))
+        ja = np.concatenate((jp, ip))
+        ra = np.concatenate((rp, rp))
+        isort = np.lexsort((ra, ia))  # sort by index, then by distance
+        ia = ia[isort]
+        first = np.nonzero(np.diff(ia, prepend=-1))[0]
+        nn[ia[first]] = ja[isort][first]
+
+    # dipoles are mutual nearest neighbors
+    ih = np.nonzero((ip==nn[jp]) & (jp==nn[ip]))[0]
+    dipoles = np.column_stack((ip[ih], jp[ih]))
+    return dipoles, rp[ih]
+
+
+def density_map(dsl, nx=20, ny=20, xpos=None, ypos=None):
+    '''Calculate binned maps of the total dislocation density and of the
+    density of geometrically necessary dislocations (GND), i.e. the net
+    Burgers vector content per area.
+
+    Parameters:
+    dsl : Dislocations
+        dislocation configuration
+    nx, ny (optional) : int
+        number of bins in x- and y-direction
+    xpos, ypos (optional) : (Ntot,)-array
+        positions to be analysed instead of current positions in dsl
+
+    Returns:
+    rho : (ny,nx)-array
+        total dislocation density per bin
+    rho_gnd : (ny,nx)-array
+        signed GND density per bin
+    xedges : (nx+1,)-array
+        bin edges in x-direction
+    yedges : (ny+1,)-array
+        bin edges in y-direction
+    '''
+    if xpos is None:
+        xpos = dsl.xpos
+    if ypos is None:
+        ypos = dsl.ypos
+    xp = np.asarray(xpos, dtype=float)
+    yp = np.asarray(ypos, dtype=float)
+    if dsl.bc=='pbc':
+        xp = np.mod(xp, dsl.lx)
+        yp = np.mod(yp, dsl.ly)
+    xedges = np.linspace(0., dsl.lx, nx+1)
+    yedges = np.linspace(0., dsl.ly, ny+1)
+    area = dsl.lx*dsl.ly/(nx*ny)
+    # y-coordinate first, such that maps can be plotted with imshow(origin='lower')
+    rho = np.histogram2d(yp, xp, bins=(yedges, xedges))[0]/area
+    rho_gnd = np.histogram2d(yp, xp, bins=(yedges, xedges),
+                             weights=burgers_sign(dsl))[0]/area
+    return rho, rho_gnd, xedges, yedges
+
+
+def analyse_frames(dsl, frames, rmax, nbins=50, hmax=None, nx=20, ny=20):
+    '''Perform pair-correlation, dipole and density analysis for a series of
+    recorded dislocation configurations. The Burgers vectors and the geometry
+    of the domain are taken from dsl.
+
+    Parameters:
+    dsl : Dislocations
+        dislocation configuration
+    frames : iterable
+        sequence of (xpos, ypos) tuples, e.g. recorded during a simulation
+    rmax : float
+        maximum radius for pair-correlation function
+    nbins (optional) : int
+        number of radial bins
+    hmax (optional) : float
+        maximum distance of dipoles, default is rmax
+    nx, ny (optional) : int
+        number of bins for density maps
+
+    Returns:
+    res : dict
+        'r' : centers of radial bins;
+        'g_all', 'g_same', 'g_opp' : (Nf,nbins)-arrays with pair-correlation functions;
+        'dipoles' : list of (M,2)-arrays with indices of dipoles in each frame;
+        'n_dipoles' : (Nf,)-array with number of dipoles;
+        'rho', 'rho_gnd' : (Nf,ny,nx)-arrays with density maps
+    '''
+    if hmax is None:
+        hmax = rmax
+    gl = []
+    dipoles = []
+    rho = []
+    rho_gnd = []
+    redges = np.linspace(0., rmax, nbins+1)
+    r = 0.5*(redges[1:] + redges[:-1])
+    for xp, yp in frames:
+        # single neighbor search per frame for both analyses
+        ip, jp, dx, dy = neighbor_pairs(xp, yp, dsl.lx, dsl.ly, max(rmax, hmax),
+                                        pbc=dsl.bc=='pbc')
+        rp = np.sqrt(dx*dx + dy*dy)
+        ih = np.nonzero(rp<rmax)[0]
+        gl.append(_pair_correlation(dsl, ip[ih], jp[ih], rp[ih], rmax, nbins)[1:])
+        ih = np.nonzero(rp<hmax)[0]
+        dipoles.append(_find_dipoles(dsl, ip[ih], jp[ih], rp[ih])[0])
+        hr, hg = density_map(dsl, nx=nx, ny=ny, xpos=xp, ypos=yp)[0:2]
+        rho.append(hr)
+        rho_gnd.append(hg)
+    gl = np.array(gl).reshape((-1, 3, nbins))
+    res = {'r': r,
+           'g_all': gl[:, 0],
+           'g_same': gl[:, 1],
+           'g_opp': gl[:, 2],
+           'dipoles': dipoles,
+           'n_dipoles': np.array([len(d) for d in dipoles]),
+           'rho': np.array(rho).reshape((-1, ny, nx)),
+           'rho_gnd': np.array(rho_gnd).reshape((-1, ny, nx))}
+    return res
@@ -0,0 +1,236 @@
+# Module pylabdd.cache
+'''Module pylabdd.cache provides an optional on-disk cache for relaxed dislocation
+configurations. The initial positions generated by ``Dislocations.positions`` and
+the subsequent relaxation with ``Dislocations.relax_disl`` are fully determined by
+the parameters of the configuration, the seed of the random number generator and
+the tolerance of the relaxation. The cache stores the relaxed configurations under
+a hash of these inputs, the backend used for the PK force (Fortran or Python) and
+the package version, such that repeated relaxations can be skipped.
+
+The cache directory is given by the environment variable ``PYLABDD_CACHE`` or
+defaults to ``~/.cache/pylabdd``. If the total size of the cache exceeds a limit,
+the least recently used entries are removed.
+
+uses NumPy
+
+Author: Alexander Hartmaier, ICAMS/Ruhr-University Bochum, December 2023
+Email: alexander.hartmaier@rub.de
+distributed under GNU General Public License (GPLv3)
+August 2025
+'''
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+
+MAX_SIZE = 2**30  # default size limit of cache in bytes
+TMP_AGE = 3600.   # age in seconds after which leftover temporary directories are removed
+FIELDS = ['xpos', 'ypos', 'bx', 'by', 'xpeq', 'ypeq']
+
+
+def cache_dir(path=None):
+    '''Return directory of cache, create it if necessary'''
+    if path is None:
+        path = os.environ.get('PYLABDD_CACHE',
+                              os.path.join(os.path.expanduser('~'), '.cache', 'pylabdd'))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_key(dsl, stol, seed, ftol, relax_all=False):
+    '''Calculate hash of all parameters that determine the relaxed configuration
+
+    Parameters:
+    dsl : Dislocations
+        dislocation configuration
+    stol : float
+        minimum distance of slip planes used in Dislocations.positions
+    seed : int
+        seed of random number generator
+    ftol : float
+        tolerance of force norm used in Dislocations.relax_disl
+    relax_all (optional) : bool
+        relax all dislocations or only mobile ones
+
+    Returns:
+    key : str
+        hexadecimal hash
+    '''
+    from pylabdd import FORT_AVAIL, __version__
+    # cast parameters, such that e.g. LX=20 and LX=20. yield the same key
+    par = {'Nd': int(dsl.Ntot), 'Nm': int(dsl.Nmob),
+           'sp_inc': [float(a) for a in dsl.sp_inc],
+           'C': float(dsl.C), 'b0': float(dsl.b0), 'dmob': float(dsl.dmob),
+           'dmax': float(dsl.dmax), 'dt0': float(dsl.dt0),
+           'LX': float(dsl.lx), 'LY': float(dsl.ly), 'bc': str(dsl.bc),
+           'stol': float(stol), 'seed': int(seed), 'ftol': float(ftol),
+           'relax_all': bool(relax_all),
+           'backend': 'fortran' if FORT_AVAIL else 'python',
+           'version': __version__}
+    return hashlib.sha256(json.dumps(par, sort_keys=True).encode()).hexdigest()
+
+
+def load(key, path=None):
+    '''Load cached configuration as memory-mapped arrays
+
+    Parameters:
+    key : str
+        hash of configuration
+    path (optional) : str
+        directory of cache
+
+    Returns:
+    conf : dict or None
+        arrays of cached configuration, None if key is not in cache
+    '''
+    try:
+        entry = os.path.join(cache_dir(path), key)
+    except OSError as e:
+        logging.warning(f'Cache directory not available: {e}')
+        return None
+    if not os.path.isdir(entry):
+        return None
+    try:
+        # copy-on-write: arrays can be modified in memory without altering the cache
+        conf = {f: np.load(os.path.join(entry, f+'.npy'), mmap_mode='c')
+                for f in FIELDS}
+    except (OSError, ValueError) as e:
+        logging.warning(f'Removing corrupted cache entry {key}: {e}')
+        shutil.rmtree(entry, ignore_errors=True)
+        return None
+    try:
+        os.utime(entry)  # mark entry as recently used
+    except OSError:
+        pass  # entry evicted concurrently, arrays are already mapped
+    return conf
+
+
+def store(key, dsl, path=None, max_size=MAX_SIZE):
+    '''Store relaxed configuration in cache and evict least recently used entries
+    if size limit is exceeded. Errors in writing the cache are logged, but not
+    raised, since the cache is optional.
+
+    Parameters:
+    key : str
+        hash of configuration
+    dsl : Dislocations
+        relaxed dislocation configuration
+    path (optional) : str
+        directory of cache
+    max_size (optional) : int
+        size limit of cache in bytes
+    '''
+    tmp = None
+    try:
+        cdir = cache_dir(path)
+        entry = os.path.join(cdir, key)
+        tmp = tempfile.mkdtemp(dir=cdir, prefix='.tmp-')
+        for f in FIELDS:
+            np.save(os.path.join(tmp, f+'.npy'), np.asarray(getattr(dsl, f), dtype=float))
+    except OSError as e:
+        logging.warning(f'Could not write cache entry {key}: {e}')
+        if tmp is not None:
+            shutil.rmtree(tmp, ignore_errors=True)
+        return
+    try:
+        os.rename(tmp, entry)  # atomic, such that incomplete entries are never loaded
+    except OSError:
+        # entry has been written concurrently
+        shutil.rmtree(tmp, ignore_errors=True)
+    try:
+        evict(path=path, max_size=max_size)
+    except OSError as e:
+        logging.warning(f'Could not evict cache entries: {e}')
+
+
+def evict(path=None, max_size=MAX_SIZE):
+    '''Remove least recently used entries until size of cache is below limit,
+    and temporary directories left over from interrupted writes
+
+    Parameters:
+    path (optional) : str
+        directory of cache
+    max_size (optional) : int
+        size limit of cache in bytes
+    '''
+    cdir = cache_dir(path)
+    entries = []
+    now = time.time()
+    for name in os.listdir(cdir):
+        entry = os.path.join(cdir, name)
+        # entries might be removed concurrently by other processes
+        try:
+            if not os.path.isdir(entry):
+                continue
+            mtime = os.path.getmtime(entry)
+            if name.startswith('.tmp-'):
+                if now-mtime>TMP_AGE:
+                    shutil.rmtree(entry, ignore_errors=True)
+                continue
+            size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+        except OSError:
+            continue
+        entries.append((mtime, size, entry))
+    entries.sort()
+    total = sum(e[1] for e in entries)
+    for mtime, size, entry in entries:
+        if total<=max_size:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+
+
+def relaxed_config(dsl, stol=0.25, seed=None, ftol=5.e-2, relax_all=False,
+                   path=None, max_size=MAX_SIZE, plot_relax=True):
+    '''Initialize random dislocation positions and relax the configuration, or
+    load the relaxed configuration from the cache if it has been calculated before.
+    The configuration is only cached if a seed is given. The Burgers vectors are
+    reset according to the slip plane inclinations before new positions are
+    generated, such that the result does not depend on previous calls.
+
+    Parameters:
+    dsl : Dislocations
+        dislocation configuration, positions and Burgers vectors will be overwritten
+    stol (optional) : float
+        minimum distance of slip planes used in Dislocations.positions
+    seed (optional) : int
+        seed of random number generator
+    ftol (optional) : float
+        tolerance of force norm used in Dislocations.relax_disl
+    relax_all (optional) : bool
+        relax all dislocations or only mobile ones
+    path (optional) : str
+        directory of cache
+    max_size (optional) : int
+        size limit of cache in bytes
+    plot_relax (optional) : bool
+        plot convergence of relaxation if configuration is not cached
+
+    Returns:
+    hit : bool
+        True if configuration has been loaded from cache
+    '''
+    dsl.bx = np.cos(dsl.sp_inc)
+    dsl.by = np.sin(dsl.sp_inc)
+    if seed is None:
+        dsl.positions(stol=stol)
+        dsl.relax_disl(relax_all=relax_all, ftol=ftol, plot_relax=plot_relax)
+        return False
+    key = cache_key(dsl, stol, seed, ftol, relax_all=relax_all)
+    conf = load(key, path=path)
+    np.random.seed(seed)
+    dsl.positions(stol=stol)  # leaves random number generator in same state as without cache
+    if conf is not None:
+        for f in FIELDS:
+            setattr(dsl, f, conf[f])
+        dsl.dx = np.zeros(dsl.Ntot)
+        dsl.dy = np.zeros(dsl.Ntot)
+        return True
+    dsl.relax_disl(relax_all=relax_all, ftol=ftol, plot_relax=plot_relax)
+    store(key, dsl, path=path, max_size=max_size)
+    return False
@@ -0,0 +1,114 @@
+import numpy as np
+import pylabdd as dd
+from pylabdd.analysis import neighbor_pairs, pair_correlation, find_dipoles, density_map, \
+    analyse_frames
+
+def brute_force_pairs(xp, yp, lx, ly, rcut, pbc):
+    pairs = set()
+    for i in range(len(xp)):
+        for j in range(i+1, len(xp)):
+            dx = xp[j] - xp[i]
+            dy = yp[j] - yp[i]
+            if pbc:
+                dx -= lx*np.round(dx/lx)
+                dy -= ly*np.round(dy/ly)
+            if dx*dx + dy*dy < rcut*rcut:
+                pairs.add((i, j))
+    return pairs
+
+def test_analysis():
+    #check if cell list finds the same pairs as brute force search
+    for pbc in [True, False]:
+        ip, jp, dx, dy = neighbor_pairs(xp, yp, LX, LY, rcut, pbc=pbc)
+        cl = set(zip(np.minimum(ip, jp), np.maximum(ip, jp)))
+        assert len(cl) == len(ip)
+        assert cl == brute_force_pairs(xp, yp, LX, LY, rcut, pbc)
+    #check cell list for cutoff radii much smaller than box and for elongated boxes
+    for x, y, lx, ly, rc in [(xc, yc, LX, LY, 1.e-3*LX), (xl, yl, 200., 1., 0.05)]:
+        for pbc in [True, False]:
+            ip, jp, dx, dy = neighbor_pairs(x, y, lx, ly, rc, pbc=pbc)
+            cl = set(zip(np.minimum(ip, jp), np.maximum(ip, jp)))
+            assert len(cl) == len(ip)
+            assert len(cl) > 0
+            assert cl == brute_force_pairs(x, y, lx, ly, rc, pbc)
+    #check normalization of pair-correlation function
+    npairs = Nd*(Nd-1)/2
+    shell = np.pi*np.diff(np.linspace(0., rcut, nbins+1)**2)/(LX*LY)
+    assert np.abs(np.sum(g_all*npairs*shell) - len(brute_force_pairs(xp, yp, LX, LY, rcut, True))) < 1E-7
+    #check that dipoles consist of dislocations with opposite sign
+    assert np.all(d1.bx[dipoles[:, 0]]*d1.bx[dipoles[:, 1]] < 0.)
+    assert np.all(dist < hmax)
+    #check dipoles of hand-placed configuration, dislocation 4 competes with 3 for 2
+    assert np.array_equal(np.sort(np.sort(dip_hp, axis=1), axis=0), [[0, 1], [2, 4]])
+    assert np.allclose(np.sort(dist_hp), [1., 1.5])
+    #check that configuration without opposite-sign pairs has no dipoles
+    assert dip_same.shape == (0, 2)
+    assert len(dist_same) == 0
+    #check normalization of pair-correlation function for fixed BC
+    assert np.abs(np.sum(g_fix*npairs*shell) - len(brute_force_pairs(xp, yp, LX, LY, rcut, False))) < 1E-7
+    #check output of batch analysis over several frames
+    assert res['r'].shape == (nbins,)
+    assert np.allclose(res['r'], r)
+    for key in ['g_all', 'g_same', 'g_opp']:
+        assert res[key].shape == (3, nbins)
+    assert np.allclose(res['g_all'][0], g_all)
+    assert len(res['dipoles']) == 3
+    assert res['n_dipoles'].shape == (3,)
+    assert res['n_dipoles'][0] == len(dipoles)
+    assert res['rho'].shape == (3, 20, 20)
+    assert res['rho_gnd'].shape == (3, 20, 20)
+    #batch analysis with different radii agrees with separate analyses
+    assert np.allclose(res_h['g_opp'][0], pair_correlation(d1, hmax, nbins=nbins)[3])
+    dip_rc = find_dipoles(d1, rcut)[0]
+    assert set(map(tuple, np.sort(res_h['dipoles'][0], axis=1))) == set(map(tuple, np.sort(dip_rc, axis=1)))
+    #check that density maps conserve number of dislocations and net Burgers vector
+    area = LX*LY/(20*20)
+    assert np.abs(np.sum(rho)*area - Nd) < 1E-7
+    assert np.abs(np.sum(rho_gnd)*area - np.sum(np.sign(d1.bx))) < 1E-7
+
+#box geometry
+LX = 100.
+LY = 100.
+Nd = 200
+rcut = 15.
+hmax = 5.
+nbins = 30
+mu = 80.0e3
+nu = 0.3
+b0 = 0.2e-3
+C = mu*b0/(2*np.pi*(1.-nu))
+np.random.seed(110)
+
+d1 = dd.Dislocations(Nd, Nd, 0., C, b0, LX=LX, LY=LY, bc='pbc')
+d1.positions()
+#clustered and elongated configurations with many close pairs
+xc = 0.5*np.random.rand(300) + 30.
+yc = 0.5*np.random.rand(300) + 99.8
+xl = 200.*np.random.rand(600)
+yl = np.random.rand(600)
+xp = d1.xpos
+yp = d1.ypos
+r, g_all, g_same, g_opp = pair_correlation(d1, rcut, nbins=nbins)
+dipoles, dist = find_dipoles(d1, hmax)
+rho, rho_gnd, xe, ye = density_map(d1, nx=20, ny=20)
+
+#hand-placed configuration with known dipoles
+d2 = dd.Dislocations(5, 5, 0., C, b0, LX=LX, LY=LY, bc='pbc')
+d2.xpos = np.array([10., 11., 50., 52., 50.])
+d2.ypos = np.array([10., 10., 50., 50., 48.5])
+d2.bx = np.array([1., -1., 1., -1., -1.])
+dip_hp, dist_hp = find_dipoles(d2, hmax)
+d2.bx = np.ones(5)
+dip_same, dist_same = find_dipoles(d2, hmax)
+
+#same configuration as d1 with fixed BC
+d3 = dd.Dislocations(Nd, Nd, 0., C, b0, LX=LX, LY=LY, bc='fixed')
+d3.xpos = xp
+d3.ypos = yp
+d3.bx = d1.bx
+g_fix = pair_correlation(d3, rcut, nbins=nbins)[1]
+
+#batch analysis of several frames
+frames = [(xp, yp), (np.mod(xp+1., LX), yp), (xp, np.mod(yp+2., LY))]
+res = analyse_frames(d1, frames, rcut, nbins=nbins, hmax=hmax)
+res_h = analyse_frames(d1, frames[0:2], hmax, nbins=nbins, hmax=rcut)
@@ -0,0 +1,95 @@
+import os
+import numpy as np
+import pylabdd as dd
+from pylabdd.cache import relaxed_config, cache_key, load, evict
+
+def new_config(lx=None):
+    if lx is None:
+        lx = LX
+    return dd.Dislocations(6, 6, 0., C, b0, LX=lx, LY=LY, bc='pbc')
+
+def entry_size(path, key):
+    entry = os.path.join(path, key)
+    return sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+
+def test_cache(tmp_path, monkeypatch):
+    #first call relaxes configuration and stores it in cache
+    d1 = new_config()
+    assert not relaxed_config(d1, seed=42, path=tmp_path, plot_relax=False)
+    rn_miss = np.random.rand(3)
+    assert len(os.listdir(tmp_path)) == 1
+    #changing a keyed input must give a miss
+    d3 = new_config()
+    assert not relaxed_config(d3, seed=43, path=tmp_path, plot_relax=False)
+    assert not relaxed_config(new_config(), seed=42, ftol=4.e-2, path=tmp_path, plot_relax=False)
+    assert len(os.listdir(tmp_path)) == 3
+    #second call must load configuration without relaxation
+    def no_relax(*args, **kwargs):
+        raise AssertionError('relaxation performed despite cache hit')
+    monkeypatch.setattr(dd.Dislocations, 'relax_disl', no_relax)
+    d2 = new_config()
+    assert relaxed_config(d2, seed=42, path=tmp_path, plot_relax=False)
+    #random number generator is in same state as after relaxation
+    assert np.linalg.norm(np.random.rand(3) - rn_miss) < 1E-12
+    for f in ['xpos', 'ypos', 'bx', 'by', 'xpeq', 'ypeq']:
+        assert np.linalg.norm(getattr(d1, f) - getattr(d2, f)) < 1E-12
+    #loaded configuration can be used for force calculation
+    assert np.linalg.norm(d1.calc_force() - d2.calc_force()) < 1E-7
+    #result must not depend on Burgers vectors flipped by previous calls
+    d2.positions()
+    assert relaxed_config(d2, seed=42, path=tmp_path, plot_relax=False)
+    assert np.linalg.norm(d1.bx - d2.bx) < 1E-12
+    assert np.linalg.norm(d1.by - d2.by) < 1E-12
+    #integer and float parameters yield the same key
+    assert cache_key(new_config(lx=20), 0.25, 42, 5.e-2) == cache_key(new_config(lx=20.), 0.25, 42, 5.e-2)
+
+    #least recently used entry is evicted first
+    k1 = cache_key(d1, 0.25, 42, 5.e-2)
+    k3 = cache_key(d3, 0.25, 43, 5.e-2)
+    for i, name in enumerate(os.listdir(tmp_path)):
+        os.utime(os.path.join(tmp_path, name), (1000.+i, 1000.+i))
+    os.utime(os.path.join(tmp_path, k1), (0., 0.))  # older entry ...
+    assert load(k1, path=tmp_path) is not None      # ... but used more recently
+    evict(path=tmp_path, max_size=entry_size(tmp_path, k1))
+    assert os.listdir(tmp_path) == [k1]
+    assert load(k3, path=tmp_path) is None
+    #stale temporary directories are removed
+    tmp = os.path.join(tmp_path, '.tmp-stale')
+    os.mkdir(tmp)
+    os.utime(tmp, (0., 0.))
+    evict(path=tmp_path)
+    assert not os.path.exists(tmp)
+    #size limit removes entries
+    evict(path=tmp_path, max_size=0)
+    assert len(os.listdir(tmp_path)) == 0
+
+def test_cache_errors(tmp_path, monkeypatch):
+    #unusable cache directory must not discard relaxation
+    path = tmp_path/'file'
+    path.write_text('')
+    d1 = new_config()
+    assert not relaxed_config(d1, seed=42, path=path, plot_relax=False)
+    assert d1.xpeq is not None
+    #entry evicted concurrently after loading is still a hit
+    d3 = new_config()
+    relaxed_config(d3, seed=42, path=tmp_path/'cache', plot_relax=False)
+    def evicted(*args, **kwargs):
+        raise FileNotFoundError('entry removed')
+    monkeypatch.setattr(os, 'utime', evicted)
+    assert load(cache_key(d3, 0.25, 42, 5.e-2), path=tmp_path/'cache') is not None
+    #failed write of cache entry leaves no temporary files
+    def disk_full(*args, **kwargs):
+        raise OSError('No space left on device')
+    monkeypatch.setattr(np, 'save', disk_full)
+    d2 = new_config()
+    assert not relaxed_config(d2, seed=42, path=tmp_path, plot_relax=False)
+    assert sorted(os.listdir(tmp_path)) == ['cache', 'file']
+    assert np.linalg.norm(d1.xpeq - d2.xpeq) < 1E-12
+
+#material parameters and box geometry
+mu = 80.0e3
+nu = 0.3
+b0 = 0.2e-3
+C = mu*b0/(2*np.pi*(1.-nu))
+LX = 20.
+LY = 20.